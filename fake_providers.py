@@ -0,0 +1,413 @@
+"""
+Curious Voice Bot - Local provider stand-ins
+FastAPI app that imitates the external OpenAI, Anthropic, ElevenLabs and Deepgram APIs
+so the backend can be exercised (and load-tested) without real credentials
+or network access.
+
+Run with:  uvicorn fake_providers:app --port 9000
+Then point the backend at it:
+    OPENAI_API_KEY=fake
+    OPENAI_BASE_URL=http://localhost:9000/v1
+    ANTHROPIC_API_KEY=fake
+    ANTHROPIC_BASE_URL=http://localhost:9000
+    ELEVENLABS_API_KEY=fake
+    ELEVENLABS_BASE_URL=http://localhost:9000
+    DEEPGRAM_API_KEY=fake
+    DEEPGRAM_BASE_URL=http://localhost:9000
+    DEEPGRAM_WS_URL=ws://localhost:9000/v1/listen
+    AUDIO_STORE=s3                                   (optional: in-memory S3 bucket)
+    S3_ENDPOINT_URL=http://localhost:9000
+
+Latency and failures are drawn per request from each provider's profile:
+    FAKE_{OPENAI,ANTHROPIC,ELEVENLABS,DEEPGRAM}_LATENCY_MS   median latency
+    FAKE_{OPENAI,ANTHROPIC,ELEVENLABS,DEEPGRAM}_ERROR_RATE   fraction of requests failing with 500/503
+    FAKE_LATENCY_SIGMA                                       lognormal spread (0 = fixed latency)
+"""
+
+from fastapi import FastAPI, WebSocket, Request, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.websockets import WebSocketDisconnect
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import time
+import uuid
+
+# The stand-in can't recognise speech, so every utterance "says" this
+FAKE_TRANSCRIPT = os.getenv("FAKE_TRANSCRIPT", "Photosynthesis is how plants turn sunlight into food.")
+# Emit one more interim word per this many bytes of audio received
+FAKE_BYTES_PER_WORD = int(os.getenv("FAKE_BYTES_PER_WORD", "8000"))
+# Gap between streamed LLM tokens / audio chunks
+FAKE_TOKEN_INTERVAL_MS = float(os.getenv("FAKE_TOKEN_INTERVAL_MS", "15"))
+FAKE_AUDIO_CHUNK_INTERVAL_MS = float(os.getenv("FAKE_AUDIO_CHUNK_INTERVAL_MS", "40"))
+# Fake mp3 size per character of synthesized text (~128 kbps speech)
+FAKE_AUDIO_BYTES_PER_CHAR = int(os.getenv("FAKE_AUDIO_BYTES_PER_CHAR", "1000"))
+FAKE_LATENCY_SIGMA = float(os.getenv("FAKE_LATENCY_SIGMA", "0.5"))
+
+@dataclass
+class Profile:
+    """Latency/error distribution for one provider"""
+    median_ms: float
+    error_rate: float = 0.0
+    sigma: float = FAKE_LATENCY_SIGMA
+
+    @classmethod
+    def from_env(cls, provider: str, median_ms: float) -> "Profile":
+        return cls(
+            median_ms=float(os.getenv(f"FAKE_{provider}_LATENCY_MS", str(median_ms))),
+            error_rate=float(os.getenv(f"FAKE_{provider}_ERROR_RATE", "0"))
+        )
+
+    def latency(self) -> float:
+        """One latency sample in seconds"""
+        if self.median_ms <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median_ms / 1000
+        return random.lognormvariate(math.log(self.median_ms), self.sigma) / 1000
+
+# Mutable at runtime, so an in-process load test can change them between runs
+PROFILES: Dict[str, Profile] = {
+    "openai": Profile.from_env("OPENAI", 400),
+    "anthropic": Profile.from_env("ANTHROPIC", 500),
+    "elevenlabs": Profile.from_env("ELEVENLABS", 300),
+    "deepgram": Profile.from_env("DEEPGRAM", 150),
+}
+
+STATS: Dict[str, int] = {"requests": 0, "errors": 0}
+
+app = FastAPI(title="Curious Voice Bot provider stand-ins")
+
+async def simulate(provider: str) -> Optional[JSONResponse]:
+    """Wait out a sampled latency; returns an error response if this request should fail"""
+    profile = PROFILES[provider]
+    STATS["requests"] += 1
+    await asyncio.sleep(profile.latency())
+    if random.random() < profile.error_rate:
+        STATS["errors"] += 1
+        status = random.choice((500, 503))
+        return JSONResponse({"error": {"message": f"Simulated {provider} failure", "type": "server_error"}},
+                            status_code=status)
+    return None
+
+@app.get("/_stats")
+async def stats():
+    """Requests served and failures injected so far"""
+    return {**STATS, "profiles": {name: vars(profile) for name, profile in PROFILES.items()}}
+
+# OpenAI
+def teaching_text(prompt: str) -> str:
+    """The teacher's words inside an extraction or question prompt"""
+    for marker in ("Teacher just said:", "Text:"):
+        if marker in prompt:
+            return prompt.rsplit(marker, 1)[1].split("\n\n")[0]
+    return prompt
+
+def fake_concepts(text: str, limit: int = 3) -> List[str]:
+    """Longest distinct words stand in for the concepts a real model would pick"""
+    words = []
+    for word in sorted(re.findall(r"[A-Za-z]{5,}", text), key=len, reverse=True):
+        if word.lower() not in [w.lower() for w in words]:
+            words.append(word.capitalize())
+        if len(words) == limit:
+            break
+    return words or ["Topic"]
+
+def fake_batch(prompt: str, field: str) -> str:
+    """Per-item answers to a micro-batched extraction prompt ("Item <id>..." blocks)"""
+    results = []
+    for index, item in re.findall(r"^Item (\d+)(.*?)(?=^Item \d+|\Z)", prompt, flags=re.M | re.S):
+        text = item.split("Text:", 1)[-1]
+        if field == "concepts":
+            results.append({"id": int(index), "concepts": fake_concepts(text)})
+        else:
+            results.append({"id": int(index), "explanation": text.strip()[:200]})
+    return json.dumps({"results": results})
+
+def fake_completion(body: Dict) -> str:
+    """Content a real model would plausibly return for this request"""
+    messages = body.get("messages", [])
+    prompt = messages[-1]["content"] if messages else ""
+    system = messages[0]["content"] if len(messages) > 1 else ""
+
+    schema = json.dumps(body.get("response_format") or {}) + system
+    if '"results"' in schema:
+        return fake_batch(prompt, "explanation" if '"explanation"' in schema else "concepts")
+    if (body.get("response_format") or {}).get("type") == "json_schema":
+        concepts = fake_concepts(teaching_text(prompt))
+        return json.dumps({
+            "concepts": [{"name": c, "explanation": f"{c} as the teacher described it."} for c in concepts],
+            "relations": [{"from": a, "to": b, "relation": "relates to"} for a, b in zip(concepts, concepts[1:])]
+        })
+    if "JSON arrays" in system or "Return ONLY a JSON array" in prompt:
+        return json.dumps(fake_concepts(teaching_text(prompt)))
+    if "relationships" in prompt.lower() and "JSON array" in prompt:
+        return "[]"
+    if prompt.startswith("From this teaching text"):
+        return teaching_text(prompt).strip()[:200]
+    if "summary" in prompt.lower() and "Updated summary" in prompt:
+        return "The teacher has been explaining " + ", ".join(fake_concepts(prompt, 5)) + "."
+    if "Feedback (markdown format)" in prompt:
+        return "## Topics covered\n- " + "\n- ".join(fake_concepts(prompt, 4)) + "\n\n## Strengths\nClear examples."
+
+    concept = random.choice(fake_concepts(teaching_text(prompt)))
+    return random.choice((
+        f"How does {concept.lower()} connect to what you explained earlier?",
+        f"What would happen if {concept.lower()} didn't exist?",
+        f"Could you give me an everyday example of {concept.lower()}?",
+    ))
+
+def completion_response(body: Dict, content: str) -> Dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+async def completion_stream(body: Dict, content: str):
+    """Server-sent events in the OpenAI chat.completion.chunk format"""
+    base = {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o")
+    }
+    for token in re.findall(r"\S+\s*", content):
+        chunk = {**base, "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(FAKE_TOKEN_INTERVAL_MS / 1000)
+    yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+    yield "data: [DONE]\n\n"
+
+@app.post("/v1/chat/completions")
+async def openai_chat_completions(request: Request):
+    """OpenAI chat completions, blocking or streamed"""
+    body = await request.json()
+    failure = await simulate("openai")
+    if failure is not None:
+        return failure
+
+    content = fake_completion(body)
+    if body.get("stream"):
+        return StreamingResponse(completion_stream(body, content), media_type="text/event-stream")
+    return completion_response(body, content)
+
+def fake_audio(text: str) -> bytes:
+    """mp3-looking bytes sized like real speech for text"""
+    return b"ID3" + bytes(max(len(text), 1) * FAKE_AUDIO_BYTES_PER_CHAR)
+
+async def audio_stream(audio: bytes, chunk_size: int = 4096):
+    for start in range(0, len(audio), chunk_size):
+        yield audio[start:start + chunk_size]
+        await asyncio.sleep(FAKE_AUDIO_CHUNK_INTERVAL_MS / 1000)
+
+@app.post("/v1/audio/speech")
+async def openai_speech(request: Request):
+    """OpenAI TTS; audio is streamed in chunks like the real endpoint"""
+    body = await request.json()
+    failure = await simulate("openai")
+    if failure is not None:
+        return failure
+    return StreamingResponse(audio_stream(fake_audio(body.get("input", ""))), media_type="audio/mpeg")
+
+@app.post("/v1/audio/transcriptions")
+async def openai_transcriptions(request: Request):
+    """OpenAI Whisper transcription"""
+    await request.body()
+    failure = await simulate("openai")
+    if failure is not None:
+        return failure
+    return {"text": FAKE_TRANSCRIPT}
+
+# Anthropic
+def anthropic_events(body: Dict, content: str):
+    """Anthropic Messages streaming events for content"""
+    message_id = f"msg_{uuid.uuid4().hex[:12]}"
+    usage = {"input_tokens": 0, "output_tokens": 0}
+    yield "message_start", {"type": "message_start", "message": {
+        "id": message_id, "type": "message", "role": "assistant", "model": body.get("model"),
+        "content": [], "stop_reason": None, "stop_sequence": None, "usage": usage
+    }}
+    yield "content_block_start", {"type": "content_block_start", "index": 0,
+                                  "content_block": {"type": "text", "text": ""}}
+    for token in re.findall(r"\S+\s*", content):
+        yield "content_block_delta", {"type": "content_block_delta", "index": 0,
+                                      "delta": {"type": "text_delta", "text": token}}
+    yield "content_block_stop", {"type": "content_block_stop", "index": 0}
+    yield "message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                            "usage": {"output_tokens": 0}}
+    yield "message_stop", {"type": "message_stop"}
+
+async def anthropic_stream(body: Dict, content: str):
+    for event, data in anthropic_events(body, content):
+        yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        if event == "content_block_delta":
+            await asyncio.sleep(FAKE_TOKEN_INTERVAL_MS / 1000)
+
+@app.post("/v1/messages")
+async def anthropic_messages(request: Request):
+    """Anthropic Messages API, blocking or streamed"""
+    body = await request.json()
+    failure = await simulate("anthropic")
+    if failure is not None:
+        return failure
+
+    # Same canned answers as OpenAI; the system prompt travels separately here
+    messages = ([{"role": "system", "content": body["system"]}] if body.get("system") else []) + body["messages"]
+    schema_requested = "JSON schema" in (body.get("system") or "")
+    content = fake_completion({"messages": messages,
+                               "response_format": {"type": "json_schema"} if schema_requested else None})
+    if body.get("stream"):
+        return StreamingResponse(anthropic_stream(body, content), media_type="text/event-stream")
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:12]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model"),
+        "content": [{"type": "text", "text": content}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 0, "output_tokens": 0}
+    }
+
+# ElevenLabs
+@app.post("/v1/text-to-speech/{voice_id}")
+async def elevenlabs_tts(voice_id: str, request: Request):
+    """ElevenLabs TTS, whole file"""
+    body = await request.json()
+    failure = await simulate("elevenlabs")
+    if failure is not None:
+        return failure
+    return Response(fake_audio(body.get("text", "")), media_type="audio/mpeg")
+
+@app.post("/v1/text-to-speech/{voice_id}/stream")
+async def elevenlabs_tts_stream(voice_id: str, request: Request):
+    """ElevenLabs streaming TTS"""
+    body = await request.json()
+    failure = await simulate("elevenlabs")
+    if failure is not None:
+        return failure
+    return StreamingResponse(audio_stream(fake_audio(body.get("text", ""))), media_type="audio/mpeg")
+
+# Deepgram
+def deepgram_result(transcript: str, is_final: bool) -> dict:
+    """Deepgram live "Results" message"""
+    return {
+        "type": "Results",
+        "is_final": is_final,
+        "speech_final": is_final,
+        "channel": {"alternatives": [{"transcript": transcript, "confidence": 0.99}]}
+    }
+
+@app.post("/v1/listen")
+async def deepgram_listen(request: Request):
+    """Deepgram batch transcription"""
+    await request.body()
+    failure = await simulate("deepgram")
+    if failure is not None:
+        return failure
+    return {"results": {"channels": [{"alternatives": [{"transcript": FAKE_TRANSCRIPT, "confidence": 0.99}]}]}}
+
+@app.websocket("/v1/listen")
+async def deepgram_listen_live(websocket: WebSocket):
+    """Deepgram live transcription: interim results while audio arrives, final on CloseStream"""
+    await websocket.accept()
+
+    words = FAKE_TRANSCRIPT.split()
+    received = 0
+    sent_words = 0
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+            if message.get("bytes") is not None:
+                received += len(message["bytes"])
+                heard = min(len(words), received // FAKE_BYTES_PER_WORD)
+                if heard > sent_words:
+                    sent_words = heard
+                    await websocket.send_text(json.dumps(deepgram_result(" ".join(words[:heard]), False)))
+                continue
+
+            if json.loads(message["text"]).get("type") == "CloseStream":
+                # Finalization latency is what the teacher waits for after they stop talking
+                await asyncio.sleep(PROFILES["deepgram"].latency())
+                await websocket.send_text(json.dumps(deepgram_result(FAKE_TRANSCRIPT, True)))
+                await websocket.close()
+                return
+    except WebSocketDisconnect:
+        pass
+
+# S3-compatible object storage (path-style, in memory; signatures are not checked)
+S3_OBJECTS: Dict[str, Dict[str, tuple]] = {}  # bucket -> key -> (data, last modified)
+
+def s3_error(code: str, status: int) -> Response:
+    return Response(f"<Error><Code>{code}</Code></Error>", status_code=status, media_type="application/xml")
+
+@app.get("/{bucket}")
+async def s3_list_objects(bucket: str, prefix: str = "", max_keys: int = Query(1000, alias="max-keys"),
+                          continuation_token: str = Query("", alias="continuation-token")):
+    """ListObjectsV2"""
+    keys = sorted(key for key in S3_OBJECTS.get(bucket, {}) if key.startswith(prefix) and key > continuation_token)
+    page = keys[:max_keys]
+    contents = "".join(
+        f"<Contents><Key>{escape(key)}</Key><Size>{len(S3_OBJECTS[bucket][key][0])}</Size>"
+        f"<LastModified>{S3_OBJECTS[bucket][key][1].strftime('%Y-%m-%dT%H:%M:%S.000Z')}</LastModified></Contents>"
+        for key in page
+    )
+    more = len(keys) > max_keys
+    token = f"<NextContinuationToken>{escape(page[-1])}</NextContinuationToken>" if more else ""
+    return Response(
+        '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+        f"<Name>{bucket}</Name><KeyCount>{len(page)}</KeyCount>"
+        f"<IsTruncated>{str(more).lower()}</IsTruncated>{token}{contents}</ListBucketResult>",
+        media_type="application/xml"
+    )
+
+@app.put("/{bucket}/{key:path}")
+async def s3_put_object(bucket: str, key: str, request: Request):
+    data = await request.body()
+    S3_OBJECTS.setdefault(bucket, {})[key] = (data, datetime.now(timezone.utc))
+    return Response(headers={"ETag": f'"{hashlib.md5(data).hexdigest()}"'})
+
+@app.api_route("/{bucket}/{key:path}", methods=["GET", "HEAD"])
+async def s3_get_object(bucket: str, key: str, request: Request):
+    stored = S3_OBJECTS.get(bucket, {}).get(key)
+    if stored is None:
+        return s3_error("NoSuchKey", 404)
+    data = stored[0]
+    headers = {"Accept-Ranges": "bytes", "ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", request.headers.get("range", ""))
+    if match and data and (match.group(1) or match.group(2)):
+        if match.group(1):
+            start = int(match.group(1))
+            end = min(int(match.group(2)) if match.group(2) else len(data) - 1, len(data) - 1)
+        else:
+            start, end = max(len(data) - int(match.group(2)), 0), len(data) - 1
+        if start > end:
+            return s3_error("InvalidRange", 416)
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        return Response(data[start:end + 1], status_code=206, media_type="audio/mpeg", headers=headers)
+    return Response(data, media_type="audio/mpeg", headers=headers)
+
+@app.delete("/{bucket}/{key:path}")
+async def s3_delete_object(bucket: str, key: str):
+    S3_OBJECTS.get(bucket, {}).pop(key, None)
+    return Response(status_code=204)
@@ -0,0 +1,346 @@
+"""
+Curious Voice Bot - Offline load test
+Runs CuriousVoice.py in-process against fake_providers.py, an in-process
+Redis (fakeredis) and SQLite, replays teaching sessions over /api/teach and
+/ws/session/{id} at a given concurrency, and reports throughput and
+p50/p95/p99 latency per endpoint.
+
+Examples:
+    python loadtest.py --sessions 50 --concurrency 10
+    python loadtest.py --mode ws-stream --openai-latency 800 --openai-errors 0.02
+    python loadtest.py --recorded sessions.jsonl --json report.json --baseline last.json
+
+Recorded sessions are JSONL, one session per line, either
+    {"topic": "...", "turns": ["teacher utterance", ...]}
+or a row exported from the sessions table:
+    {"topic": "...", "conversation_history": [{"role": "teacher", "content": "..."}, ...]}
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Built in so the harness runs with no input files
+SAMPLE_SESSIONS = [
+    {"topic": "Photosynthesis", "turns": [
+        "Photosynthesis is how plants turn sunlight, water and carbon dioxide into glucose and oxygen.",
+        "It happens in the chloroplasts, which contain a green pigment called chlorophyll.",
+        "The light reactions capture energy, and the Calvin cycle uses it to build sugars.",
+        "Without photosynthesis there would be almost no oxygen in the atmosphere.",
+    ]},
+    {"topic": "Newton's laws", "turns": [
+        "Newton's first law says an object keeps moving at constant velocity unless a force acts on it.",
+        "The second law says force equals mass times acceleration.",
+        "The third law says every action has an equal and opposite reaction, like a rocket pushing exhaust.",
+    ]},
+    {"topic": "Cell division", "turns": [
+        "Mitosis is how a cell divides into two identical daughter cells.",
+        "Before dividing, the cell copies its DNA during the S phase of interphase.",
+        "During metaphase the chromosomes line up in the middle of the cell.",
+        "Meiosis is different because it produces four cells with half the chromosomes.",
+        "That halving is why sexual reproduction mixes genes from two parents.",
+    ]},
+    {"topic": "Supply and demand", "turns": [
+        "Prices are set where the supply curve meets the demand curve.",
+        "When demand rises and supply stays the same, the price goes up.",
+        "Elasticity measures how strongly demand reacts to a change in price.",
+    ]},
+]
+
+ENDPOINTS = ("POST /api/sessions", "POST /api/teach", "WS turn", "WS turn (first audio)",
+             "POST /api/sessions/{id}/end")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline load test for CuriousVoice.py")
+    parser.add_argument("--sessions", type=int, default=20, help="sessions to replay")
+    parser.add_argument("--concurrency", type=int, default=5, help="sessions running at once")
+    parser.add_argument("--mode", choices=("http", "ws", "ws-stream", "mixed"), default="mixed",
+                        help="how turns are sent; mixed picks per session")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pause between turns, seconds")
+    parser.add_argument("--recorded", help="JSONL file of recorded sessions (default: built-in samples)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--openai-latency", type=float, help="median ms (default from FAKE_OPENAI_LATENCY_MS)")
+    parser.add_argument("--openai-errors", type=float, help="error rate 0-1")
+    parser.add_argument("--anthropic-latency", type=float)
+    parser.add_argument("--anthropic-errors", type=float)
+    parser.add_argument("--elevenlabs-latency", type=float)
+    parser.add_argument("--elevenlabs-errors", type=float)
+    parser.add_argument("--deepgram-latency", type=float)
+    parser.add_argument("--deepgram-errors", type=float)
+    parser.add_argument("--json", help="write the report as JSON to this file")
+    parser.add_argument("--baseline", help="earlier --json report to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="fail if any endpoint's p95 grows by more than this fraction of the baseline")
+    parser.add_argument("--max-error-rate", type=float, default=0.05,
+                        help="fail if more than this fraction of requests error")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's INFO logging")
+    return parser.parse_args()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def configure_environment(provider_port: int, workdir: str):
+    """Point the app at the stand-ins; must run before CuriousVoice is imported"""
+    provider_url = f"http://127.0.0.1:{provider_port}"
+    os.environ.update({
+        "OPENAI_API_KEY": "fake",
+        "OPENAI_BASE_URL": f"{provider_url}/v1",
+        "ANTHROPIC_API_KEY": "fake",
+        "ANTHROPIC_BASE_URL": provider_url,
+        "ELEVENLABS_API_KEY": "fake",
+        "ELEVENLABS_BASE_URL": provider_url,
+        "DEEPGRAM_API_KEY": "fake",
+        "DEEPGRAM_BASE_URL": provider_url,
+        "DEEPGRAM_WS_URL": f"ws://127.0.0.1:{provider_port}/v1/listen",
+        "REDIS_URL": "memory://",
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'loadtest.db')}",
+        "TTS_CACHE_DIR": os.path.join(workdir, "tts_cache"),
+        "LOG_DIR": os.path.join(workdir, "logs"),
+        "RATE_LIMITS_ENABLED": "false",
+    })
+
+def load_sessions(path: Optional[str]) -> List[Dict]:
+    if path is None:
+        return SAMPLE_SESSIONS
+    sessions = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            turns = record.get("turns") or [
+                message["content"] for message in record.get("conversation_history", [])
+                if message.get("role") == "teacher"
+            ]
+            if turns:
+                sessions.append({"topic": record.get("topic"), "turns": turns})
+    if not sessions:
+        raise SystemExit(f"No sessions with teacher turns in {path}")
+    return sessions
+
+class Recorder:
+    """Latency samples and error counts per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def ok(self, endpoint: str, seconds: float):
+        self.latencies[endpoint].append(seconds)
+
+    def error(self, endpoint: str):
+        self.errors[endpoint] += 1
+
+    @staticmethod
+    def percentile(samples: List[float], p: float) -> float:
+        """Nearest-rank percentile"""
+        ordered = sorted(samples)
+        return ordered[max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))]
+
+    def report(self, wall_seconds: float) -> Dict[str, Dict]:
+        report = {}
+        for endpoint in ENDPOINTS:
+            samples, errors = self.latencies.get(endpoint, []), self.errors.get(endpoint, 0)
+            if not samples and not errors:
+                continue
+            entry = {"count": len(samples), "errors": errors, "throughput": len(samples) / wall_seconds}
+            if samples:
+                entry.update({f"p{p}": self.percentile(samples, p) for p in (50, 95, 99)})
+            report[endpoint] = entry
+        return report
+
+async def replay_session(base_url: str, session: Dict, mode: str, think_time: float,
+                         recorder: Recorder, http) -> None:
+    """One virtual teacher: create a session, teach every turn, end it"""
+    import websockets
+
+    start = time.perf_counter()
+    response = await http.post("/api/sessions", json={"user_id": "loadtest", "topic": session["topic"]})
+    if response.status_code != 200:
+        recorder.error("POST /api/sessions")
+        return
+    recorder.ok("POST /api/sessions", time.perf_counter() - start)
+    session_id = response.json()["session_id"]
+
+    websocket = None
+    if mode != "http":
+        websocket = await websockets.connect(f"{base_url.replace('http', 'ws', 1)}/ws/session/{session_id}",
+                                             max_size=None)
+    try:
+        for text in session["turns"]:
+            if mode == "http":
+                start = time.perf_counter()
+                response = await http.post("/api/teach", json={"session_id": session_id, "text": text})
+                if response.status_code == 200:
+                    recorder.ok("POST /api/teach", time.perf_counter() - start)
+                else:
+                    recorder.error("POST /api/teach")
+            else:
+                await ws_turn(websocket, text, mode == "ws-stream", recorder)
+            if think_time:
+                await asyncio.sleep(think_time)
+    finally:
+        if websocket is not None:
+            await websocket.close()
+
+    start = time.perf_counter()
+    response = await http.post(f"/api/sessions/{session_id}/end")
+    if response.status_code == 200:
+        recorder.ok("POST /api/sessions/{id}/end", time.perf_counter() - start)
+    else:
+        recorder.error("POST /api/sessions/{id}/end")
+
+async def ws_turn(websocket, text: str, stream: bool, recorder: Recorder):
+    """Send one text turn and wait for its final response"""
+    start = time.perf_counter()
+    first_audio = None
+    await websocket.send(json.dumps({"type": "text", "text": text, "stream": stream}))
+    while True:
+        message = await websocket.recv()
+        if isinstance(message, bytes):
+            if first_audio is None:
+                first_audio = time.perf_counter() - start
+            continue
+        event = json.loads(message)
+        if event["type"] == "response":
+            recorder.ok("WS turn", time.perf_counter() - start)
+            if first_audio is not None:
+                recorder.ok("WS turn (first audio)", first_audio)
+            return
+        if event["type"] == "error":
+            recorder.error("WS turn")
+            return
+
+def print_report(report: Dict[str, Dict], wall_seconds: float, baseline: Optional[Dict]):
+    print(f"\nWall time {wall_seconds:.1f}s")
+    print(f"{'endpoint':<30} {'count':>6} {'errors':>6} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint, entry in report.items():
+        line = (f"{endpoint:<30} {entry['count']:>6} {entry['errors']:>6} {entry['throughput']:>7.2f} "
+                + " ".join(f"{entry[p] * 1000:>8.0f}" if p in entry else f"{'-':>8}" for p in ("p50", "p95", "p99")))
+        previous = (baseline or {}).get(endpoint, {})
+        if "p95" in previous and "p95" in entry:
+            line += f"   p95 {(entry['p95'] / previous['p95'] - 1) * 100:+.0f}% vs baseline"
+        print(line)
+
+def check(report: Dict[str, Dict], baseline: Optional[Dict], max_regression: float, max_error_rate: float) -> List[str]:
+    """Regressions that should fail the run"""
+    failures = []
+    for endpoint, entry in report.items():
+        total = entry["count"] + entry["errors"]
+        if total and entry["errors"] / total > max_error_rate:
+            failures.append(f"{endpoint}: error rate {entry['errors'] / total:.1%} > {max_error_rate:.1%}")
+        previous = (baseline or {}).get(endpoint, {})
+        if "p95" in previous and "p95" in entry and entry["p95"] > previous["p95"] * (1 + max_regression):
+            failures.append(f"{endpoint}: p95 {entry['p95'] * 1000:.0f}ms vs baseline {previous['p95'] * 1000:.0f}ms")
+    return failures
+
+async def serve(app, port: int):
+    """Start a uvicorn server in this event loop; returns it once it accepts connections"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()  # Surface the startup error
+        await asyncio.sleep(0.05)
+    return server, task
+
+async def wait_ready(http, timeout: float = 60.0):
+    """Poll /ready until the app has finished warming up"""
+    deadline = time.monotonic() + timeout
+    while (await http.get("/ready")).status_code != 200:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"App not ready after {timeout:.0f}s")
+        await asyncio.sleep(0.1)
+
+async def main(args: argparse.Namespace) -> int:
+    import httpx
+    import fake_providers
+
+    for provider in ("openai", "anthropic", "elevenlabs", "deepgram"):
+        latency, errors = getattr(args, f"{provider}_latency"), getattr(args, f"{provider}_errors")
+        if latency is not None:
+            fake_providers.PROFILES[provider].median_ms = latency
+        if errors is not None:
+            fake_providers.PROFILES[provider].error_rate = errors
+
+    workdir = tempfile.mkdtemp(prefix="curious-loadtest-")
+    provider_port, app_port = free_port(), free_port()
+    configure_environment(provider_port, workdir)
+
+    import CuriousVoice
+    if not args.verbose:
+        CuriousVoice.logger.remove()
+        CuriousVoice.logger.add(sys.stderr, level="WARNING")
+
+    providers_server, providers_task = await serve(fake_providers.app, provider_port)
+    app_server, app_task = await serve(CuriousVoice.app, app_port)
+    base_url = f"http://127.0.0.1:{app_port}"
+
+    rng = random.Random(args.seed)
+    sessions = load_sessions(args.recorded)
+    plan = [(sessions[i % len(sessions)],
+             rng.choice(("http", "ws", "ws-stream")) if args.mode == "mixed" else args.mode)
+            for i in range(args.sessions)]
+
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as http:
+        async def run(session: Dict, mode: str):
+            async with semaphore:
+                try:
+                    await replay_session(base_url, session, mode, args.think_time, recorder, http)
+                except Exception as e:
+                    print(f"Session failed: {e!r}", file=sys.stderr)
+                    recorder.error("WS turn" if mode != "http" else "POST /api/teach")
+
+        await wait_ready(http)
+        print(f"Replaying {args.sessions} sessions ({args.mode}) at concurrency {args.concurrency}...")
+        start = time.perf_counter()
+        await asyncio.gather(*(run(session, mode) for session, mode in plan))
+        wall_seconds = time.perf_counter() - start
+
+    for server in (app_server, providers_server):
+        server.should_exit = True
+    await asyncio.gather(app_task, providers_task)
+
+    report = recorder.report(wall_seconds)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["endpoints"]
+
+    print_report(report, wall_seconds, baseline)
+    print(f"Provider stand-ins: {fake_providers.STATS['requests']} requests, "
+          f"{fake_providers.STATS['errors']} injected failures")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "config": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")},
+                "wall_seconds": wall_seconds,
+                "endpoints": report
+            }, f, indent=2)
+
+    failures = check(report, baseline, args.max_regression, args.max_error_rate)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    random.seed(arguments.seed)
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,42 @@
+"""
+Shared setup: CuriousVoice runs against the in-process provider stand-ins
+(fake_providers.py) with an in-memory Redis and a throwaway SQLite database.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import loadtest
+
+PROVIDER_PORT = loadtest.free_port()
+loadtest.configure_environment(PROVIDER_PORT, tempfile.mkdtemp(prefix="curious-tests-"))
+
+import CuriousVoice  # noqa: E402  (must follow configure_environment)
+import fake_providers  # noqa: E402
+
+@pytest.fixture
+def providers(monkeypatch):
+    """Run a coroutine with the provider stand-ins serving; fixed latency, no injected errors"""
+    for provider, profile in fake_providers.PROFILES.items():
+        monkeypatch.setattr(profile, "sigma", 0.0)
+        monkeypatch.setattr(profile, "error_rate", 0.0)
+    
+    def run(coro_fn):
+        async def main():
+            server, task = await loadtest.serve(fake_providers.app, PROVIDER_PORT)
+            try:
+                return await coro_fn()
+            finally:
+                # Pooled connections belong to this event loop
+                await CuriousVoice.clients.close()
+                server.should_exit = True
+                await task
+        return asyncio.run(main())
+    
+    return run
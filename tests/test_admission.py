@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+import CuriousVoice as cv
+
+def controller(concurrency: int = 1, max_wait: float = 2.0):
+    """Admission controller for one provider, on its own Redis"""
+    return cv.AdmissionController(fakeredis.FakeAsyncRedis(decode_responses=True),
+                                  limits={"llm": (concurrency, 0)}, enabled=True, max_wait=max_wait)
+
+async def in_flight(admission) -> int:
+    return await admission.client.zcard(admission._key("llm", "leases"))
+
+def test_leaked_lease_is_reclaimed_after_expiry(monkeypatch):
+    monkeypatch.setattr(cv, "ADMISSION_LEASE_SECONDS", 0.3)
+    
+    async def scenario():
+        admission = controller()
+        await admission.acquire("llm")  # Never released, as if its worker crashed
+        start = time.perf_counter()
+        lease = await admission.acquire("llm")
+        return time.perf_counter() - start, lease, await in_flight(admission)
+    
+    waited, lease, leases = asyncio.run(scenario())
+    assert 0.2 < waited < 1.0
+    assert lease and leases == 1
+
+def test_waiting_sessions_are_served_round_robin():
+    async def scenario():
+        admission = controller()
+        held = await admission.acquire("llm")
+        served = []
+        
+        async def call(session: str):
+            cv.session_id_var.set(session)
+            async with admission.slot("llm"):
+                served.append(session)
+                await asyncio.sleep(0.01)
+        
+        # A busy session queues three calls before a quiet one queues its first
+        tasks = [asyncio.create_task(call(session)) for session in ("busy", "busy", "busy", "quiet")]
+        await asyncio.sleep(0.05)
+        await admission.release("llm", held)
+        await asyncio.gather(*tasks)
+        return served, await in_flight(admission)
+    
+    served, leases = asyncio.run(scenario())
+    assert served == ["busy", "quiet", "busy", "busy"]
+    assert leases == 0
+
+def test_acquire_gives_up_after_max_wait():
+    async def scenario():
+        admission = controller(max_wait=0.2)
+        await admission.acquire("llm")
+        start = time.perf_counter()
+        with pytest.raises(cv.UpstreamBusy):
+            await admission.acquire("llm")
+        waited = time.perf_counter() - start
+        await asyncio.sleep(0.1)
+        return waited, await in_flight(admission), admission.snapshot()
+    
+    waited, leases, waiting = asyncio.run(scenario())
+    assert 0.15 < waited < 0.5
+    assert leases == 1
+    assert waiting == {"llm": 0}
+
+def test_cancelled_waiter_passes_its_slot_on_without_leaking():
+    async def scenario():
+        admission = controller()
+        held = await admission.acquire("llm")
+        first = asyncio.create_task(admission.acquire("llm"))
+        second = asyncio.create_task(admission.acquire("llm"))
+        await asyncio.sleep(0.05)
+        
+        first.cancel()  # Barge-in while queued
+        await admission.release("llm", held)
+        lease = await asyncio.wait_for(second, 1)
+        await asyncio.sleep(0.1)
+        return first.cancelled(), lease, await admission.client.zrange(admission._key("llm", "leases"), 0, -1)
+    
+    cancelled, lease, leases = asyncio.run(scenario())
+    assert cancelled
+    assert leases == [lease]
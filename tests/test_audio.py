@@ -0,0 +1,68 @@
+import asyncio
+import io
+import json
+import wave
+
+import httpx
+import numpy as np
+import websockets
+
+import CuriousVoice as cv
+import loadtest
+
+def wav_bytes(samples: np.ndarray, rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((samples * 32767).astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+def level_at(samples: np.ndarray, rate: int, frequency: float) -> float:
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return spectrum[int(round(frequency * len(samples) / rate))]
+
+def test_downsampling_filters_content_above_target_nyquist():
+    rate = 48000
+    t = np.arange(rate) / rate
+    # 12 kHz cannot be represented at 16 kHz and would alias to 4 kHz
+    samples = (0.4 * np.sin(2 * np.pi * 1000 * t) + 0.4 * np.sin(2 * np.pi * 12000 * t)).astype(np.float32)
+    
+    resampled = cv.AudioPreprocessor(target_rate=16000)._resample(samples, rate)
+    
+    assert len(resampled) == 16000
+    assert level_at(resampled, 16000, 4000) < level_at(resampled, 16000, 1000) / 1000
+
+def test_silent_utterance_gets_no_speech_instead_of_a_turn(providers, monkeypatch):
+    monkeypatch.setattr(cv, "STREAMING_STT", False)
+    
+    async def scenario():
+        port = loadtest.free_port()
+        server, task = await loadtest.serve(cv.app, port)
+        try:
+            async with websockets.connect(f"ws://127.0.0.1:{port}/ws/session/no-such-session") as ws:
+                await ws.send(json.dumps({"type": "audio_start", "stream_stt": False}))
+                await ws.send(wav_bytes(np.zeros(16000, dtype=np.float32), 16000))
+                await ws.send(json.dumps({"type": "audio_end"}))
+                return json.loads(await asyncio.wait_for(ws.recv(), 10))
+        finally:
+            server.should_exit = True
+            await task
+    
+    assert providers(scenario)["type"] == "no_speech"
+
+def test_pre_cache_audio_urls_still_resolve(tmp_path, monkeypatch):
+    monkeypatch.setattr(cv, "LEGACY_AUDIO_DIR", str(tmp_path))
+    (tmp_path / "session_0123abcd.mp3").write_bytes(b"ID3 legacy audio")
+    
+    async def scenario():
+        transport = httpx.ASGITransport(app=cv.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await client.get(f"/audio/{name}")
+                    for name in ("session_0123abcd.mp3", "missing.mp3", "..%2Fsecret.mp3")]
+    
+    found, missing, traversal = asyncio.run(scenario())
+    assert found.status_code == 200 and found.content == b"ID3 legacy audio"
+    assert found.headers["content-type"] == "audio/mpeg"
+    assert missing.status_code == 404 and traversal.status_code == 404
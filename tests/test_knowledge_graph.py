@@ -0,0 +1,54 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+import CuriousVoice as cv
+import fake_providers
+
+def test_cancelled_turn_stops_multi_call_extraction(providers, monkeypatch):
+    """A barge-in cancels explanation calls in flight instead of finishing the turn"""
+    monkeypatch.setattr(cv, "FUSED_EXTRACTION", False)
+    monkeypatch.setattr(cv, "EXTRACTION_BATCHING", False)
+    monkeypatch.setattr(cv.load_policy, "skip_explanations", lambda: False)
+    for provider in ("openai", "anthropic"):
+        monkeypatch.setattr(fake_providers.PROFILES[provider], "median_ms", 500)
+    
+    async def scenario():
+        kg = cv.KnowledgeGraph(str(uuid.uuid4()))
+        # Unique text so nothing is served from the extraction cache
+        text = f"Photosynthesis uses chlorophyll and sunlight to make glucose. ({uuid.uuid4()})"
+        task = asyncio.create_task(kg.process_teaching(text))
+        await asyncio.sleep(0.8)  # Concepts extracted, first explanation call in flight
+        assert not task.done()
+        
+        requests_at_cancel = fake_providers.STATS["requests"]
+        start = time.perf_counter()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        elapsed = time.perf_counter() - start
+        
+        await asyncio.sleep(1.0)
+        return elapsed, fake_providers.STATS["requests"] - requests_at_cancel
+    
+    elapsed, later_requests = providers(scenario)
+    assert elapsed < 0.2
+    assert later_requests == 0
+
+def test_fused_extraction_skips_names_that_normalize_to_nothing(monkeypatch):
+    async def fused(self, text):
+        return {
+            "concepts": [{"name": "...", "explanation": "ellipsis"},
+                         {"name": "Chlorophyll", "explanation": "green pigment"}],
+            "relations": [{"from": "...", "relation": "absorbs", "to": "Chlorophyll"}]
+        }
+    
+    monkeypatch.setattr(cv, "FUSED_EXTRACTION", True)
+    monkeypatch.setattr(cv.KnowledgeGraph, "_extract_knowledge_fused", fused)
+    kg = cv.KnowledgeGraph(str(uuid.uuid4()))
+    asyncio.run(kg.process_teaching("Chlorophyll absorbs light..."))
+    
+    assert list(kg.graph.concepts) == ["chlorophyll"]
+    assert kg.graph.concepts["chlorophyll"]["definitions"] == ["green pigment"]
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+import CuriousVoice as cv
+
+class FakeProvider:
+    """Provider whose first token / completion arrives after a fixed delay"""
+    
+    def __init__(self, name: str, delay: float, tokens=("a", "b", "c"), token_interval: float = 0.0):
+        self.name = name
+        self.delay = delay
+        self.tokens = tokens
+        self.token_interval = token_interval
+        self.closed = False
+        self.cancelled = False
+    
+    def model_for(self, requested: str) -> str:
+        return requested
+    
+    async def complete(self, messages, model, response_format=None, max_tokens=500, temperature=0.7) -> str:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.name
+    
+    async def stream(self, messages, model, max_tokens=500, temperature=0.7):
+        try:
+            await asyncio.sleep(self.delay)
+            for token in self.tokens:
+                yield token
+                await asyncio.sleep(self.token_interval)
+        finally:
+            self.closed = True
+
+@pytest.fixture
+def admission(monkeypatch):
+    """Fresh admission controller with one slot per fake provider"""
+    controller = cv.AdmissionController(fakeredis.FakeAsyncRedis(decode_responses=True),
+                                        limits={"slow": (1, 0), "fast": (1, 0)}, enabled=True)
+    monkeypatch.setattr(cv, "admission", controller)
+    return controller
+
+async def in_flight(controller, provider: str) -> int:
+    return await controller.client.zcard(controller._key(provider, "leases"))
+
+def test_breaker_opens_half_opens_and_closes():
+    breaker = cv.CircuitBreaker("p", threshold=2, cooldown=0.05)
+    breaker.failure()
+    assert breaker.state == "closed"
+    breaker.failure()
+    assert breaker.state == "open" and not breaker.acquire()
+    
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.acquire()
+    assert not breaker.acquire()  # Only one trial at a time
+    breaker.failure()  # Failed trial: open again with a fresh cooldown
+    assert breaker.state == "open"
+    
+    time.sleep(0.06)
+    assert breaker.acquire()
+    breaker.release()  # Abandoned trial (lost a hedge) frees the slot without an outcome
+    assert breaker.acquire()
+    breaker.success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+def test_hedged_completion_cancels_loser_and_frees_its_slot(admission):
+    slow, fast = FakeProvider("slow", 1.0), FakeProvider("fast", 0.01)
+    router = cv.LLMRouter([slow, fast], hedge_delay=0.05)
+    
+    async def scenario():
+        text = await router.complete("test", [{"role": "user", "content": "hi"}], "m", 10, 0.0)
+        return text, await in_flight(admission, "slow"), await in_flight(admission, "fast")
+    
+    text, slow_leases, fast_leases = asyncio.run(scenario())
+    assert text == "fast"
+    assert slow.cancelled
+    assert slow_leases == fast_leases == 0
+    assert router.breakers["slow"].state == "closed"
+
+def test_hedged_stream_releases_loser_before_winner_finishes(admission):
+    slow = FakeProvider("slow", 1.0)
+    fast = FakeProvider("fast", 0.01, tokens=("x", "y", "z"), token_interval=0.05)
+    router = cv.LLMRouter([slow, fast], hedge_delay=0.05)
+    
+    async def scenario():
+        stream = router.stream("test", [{"role": "user", "content": "hi"}], "m", 10, 0.0)
+        first = await stream.__anext__()
+        mid_stream = (slow.closed, await in_flight(admission, "slow"), await in_flight(admission, "fast"))
+        rest = [token async for token in stream]
+        after = (fast.closed, await in_flight(admission, "fast"))
+        return [first, *rest], mid_stream, after
+    
+    tokens, (slow_closed, slow_leases, fast_leases), (fast_closed, fast_after) = asyncio.run(scenario())
+    assert tokens == ["x", "y", "z"]
+    assert slow_closed and slow_leases == 0
+    assert fast_leases == 1  # The winner keeps its slot until its stream ends
+    assert fast_closed and fast_after == 0
+
+def test_abandoned_stream_returns_its_connection(providers):
+    provider = cv.OpenAIChatProvider("openai", lambda: cv.clients.openai)
+    
+    async def scenario():
+        for _ in range(3):
+            stream = provider.stream([{"role": "user", "content": "Tell me about photosynthesis"}], "gpt-4o")
+            await stream.__anext__()
+            await stream.aclose()
+        pool = cv.clients.openai._client._transport._pool
+        # Cut-short responses may be dropped rather than reused; none may stay busy
+        return [c for c in pool.connections if not (c.is_idle() or c.is_closed())]
+    
+    assert providers(scenario) == []
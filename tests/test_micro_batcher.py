@@ -0,0 +1,56 @@
+import asyncio
+import uuid
+
+import CuriousVoice as cv
+
+def test_results_map_back_to_their_callers():
+    batches = []
+    
+    async def handler(items):
+        batches.append(items)
+        await asyncio.sleep(0.01)
+        return [item.upper() if item != "skip" else None for item in items]
+    
+    async def scenario():
+        batcher = cv.MicroBatcher("test", handler, window=0.05, max_size=8)
+        return await asyncio.gather(*(batcher.submit(item) for item in ("a", "skip", "c", "d")))
+    
+    assert asyncio.run(scenario()) == ["A", None, "C", "D"]
+    assert batches == [["a", "skip", "c", "d"]]
+
+def test_short_or_failed_batches_leave_callers_to_fall_back():
+    async def short(items):
+        return ["first"]
+    
+    async def failing(items):
+        raise ValueError("malformed batch response")
+    
+    async def scenario():
+        results = []
+        for handler in (short, failing):
+            batcher = cv.MicroBatcher("test", handler, window=0.01, max_size=8)
+            results.append(await asyncio.wait_for(asyncio.gather(batcher.submit(1), batcher.submit(2)), 1))
+        return results
+    
+    assert asyncio.run(scenario()) == [["first", None], [None, None]]
+
+def test_explanation_falls_back_to_own_request_when_batch_fails(monkeypatch):
+    calls = []
+    
+    async def failing(items):
+        raise ValueError("malformed batch response")
+    
+    async def complete(stage, **kwargs):
+        calls.append(stage)
+        return " uses sunlight to make sugar "
+    
+    monkeypatch.setattr(cv, "EXTRACTION_BATCHING", True)
+    monkeypatch.setattr(cv, "explanation_batcher", cv.MicroBatcher("explanation", failing, window=0.01))
+    monkeypatch.setattr(cv.llm, "complete", complete)
+    
+    kg = cv.KnowledgeGraph(str(uuid.uuid4()))
+    text = f"Photosynthesis uses sunlight to make sugar. ({uuid.uuid4()})"
+    explanation = asyncio.run(kg._extract_explanation(text, "photosynthesis"))
+    
+    assert explanation == "uses sunlight to make sugar"
+    assert calls == ["extraction_explanation"]
@@ -0,0 +1,21 @@
+import asyncio
+
+import CuriousVoice as cv
+
+def test_drain_waits_for_in_flight_work_and_cancels_stragglers():
+    async def scenario():
+        manager = cv.SessionManager()
+        finished = []
+        
+        async def finalize():
+            await asyncio.sleep(0.1)
+            finished.append("feedback")
+        
+        manager._finalizing["session"] = asyncio.create_task(finalize())
+        stuck = manager._spawn(asyncio.sleep(60))
+        await manager.drain(timeout=0.5)
+        return finished, stuck
+    
+    finished, stuck = asyncio.run(scenario())
+    assert finished == ["feedback"]
+    assert stuck.cancelled()
@@ -0,0 +1,53 @@
+import asyncio
+import uuid
+
+from sqlalchemy import select
+
+import CuriousVoice as cv
+
+async def rows(*session_ids):
+    async with cv.AsyncSessionLocal() as db:
+        result = await db.execute(select(cv.Session).where(cv.Session.id.in_(session_ids)))
+        return {row.id: row for row in result.scalars()}
+
+def run(coro_fn):
+    async def main():
+        async with cv.async_engine.begin() as conn:
+            await conn.run_sync(cv.Base.metadata.create_all)
+        return await coro_fn(cv.SessionPersister(cv.AsyncSessionLocal))
+    return asyncio.run(main())
+
+def test_update_for_missing_row_does_not_block_batch():
+    created, missing = str(uuid.uuid4()), str(uuid.uuid4())
+    
+    async def scenario(persister):
+        persister.enqueue_create(created, topic="photosynthesis", conversation_history=[])
+        persister.enqueue_update(missing, conversation_history=[{"role": "teacher", "content": "hi"}])
+        assert await persister.flush()
+        return persister.pending_for(created), persister.pending_for(missing), await rows(created, missing)
+    
+    pending_created, pending_missing, found = run(scenario)
+    assert pending_created == pending_missing == {}
+    assert set(found) == {created}
+    assert found[created].topic == "photosynthesis"
+
+def test_failing_row_is_isolated_and_dropped_after_max_attempts():
+    existing, good = str(uuid.uuid4()), str(uuid.uuid4())
+    
+    async def scenario(persister):
+        persister.enqueue_create(existing, topic="first")
+        assert await persister.flush()
+        # Duplicate primary key: fails on every attempt, must not hold back the other rows
+        persister.enqueue_create(existing, topic="duplicate")
+        persister.enqueue_create(good, topic="good")
+        persister.enqueue_update(existing, duration_seconds=42)
+        
+        assert await persister.flush()
+        first = await rows(existing, good)
+        await persister.stop()  # Keeps retrying the bad row until it is dropped
+        return first, persister.pending_for(existing), await rows(existing, good)
+    
+    first, pending, found = run(scenario)
+    assert first[good].topic == "good"
+    assert pending == {}
+    assert found[existing].topic == "first"
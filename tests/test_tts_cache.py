@@ -0,0 +1,52 @@
+import asyncio
+import os
+
+import fakeredis
+
+import CuriousVoice as cv
+
+def key(i: int) -> str:
+    return f"{i:064x}"
+
+def workers(tmp_path, count: int = 2, **options):
+    """TTS caches as separate workers would build them: same directory and Redis, no shared memory"""
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return [cv.TTSCache(cv.LocalAudioStore(str(tmp_path)), client, **options) for _ in range(count)]
+
+def test_size_cap_is_shared_across_workers(tmp_path):
+    async def scenario():
+        first, second = workers(tmp_path, max_bytes=2500, evict_grace=0)
+        await first.load()
+        await first.put(key(0), b"a" * 1000)
+        await second.put(key(1), b"b" * 1000)
+        assert await second.lookup(key(0))  # Seen by the other worker, now most recently used
+        await first.put(key(2), b"c" * 1000)
+        return await first.snapshot(), await second.lookup(key(1))
+    
+    snapshot, evicted_present = asyncio.run(scenario())
+    assert sorted(os.listdir(tmp_path)) == [f"{key(0)}.mp3", f"{key(2)}.mp3"]
+    assert snapshot["bytes"] == 2000 and snapshot["entries"] == 2
+    assert not evicted_present
+
+def test_recently_used_blobs_survive_eviction(tmp_path):
+    async def scenario():
+        first, second = workers(tmp_path, max_bytes=1500, evict_grace=60)
+        await first.put(key(0), b"a" * 1000)
+        await second.put(key(1), b"b" * 1000)
+        return await first.snapshot()
+    
+    snapshot = asyncio.run(scenario())
+    assert len(os.listdir(tmp_path)) == 2
+    assert snapshot["bytes"] == 2000
+
+def test_load_from_every_worker_counts_blobs_once(tmp_path):
+    for i in range(3):
+        (tmp_path / f"{key(i)}.mp3").write_bytes(b"x" * 100)
+    
+    async def scenario():
+        caches = workers(tmp_path, count=3)
+        await asyncio.gather(*(cache.load() for cache in caches))
+        return await caches[0].snapshot()
+    
+    snapshot = asyncio.run(scenario())
+    assert snapshot["entries"] == 3 and snapshot["bytes"] == 300